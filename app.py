@@ -1,9 +1,10 @@
 import sys
-import pandas as pd
 
-from crawler import crawl_site
+from crawler import crawl_site, fetch_sitemap
 from auditor import run_audit
-from reporter import generate_xlsx_report
+from frontier import PRIORITY_STRATEGIES
+from config import CRAWL_PRIORITY
+from reporter import generate_xlsx_report, save_raw_data_csv
 
 def main():
     """Main function to run the full SEO audit process."""
@@ -52,9 +53,28 @@ def main():
         sitemap_input = input(f"Enter the sitemap URL (or press Enter for {default_sitemap_url}): ")
         sitemap_url = sitemap_input or default_sitemap_url
 
-    print(f"\nStarting SEO audit for {base_url} (max {max_pages} pages)...")
+    while True:
+        priority_input = input(f"Crawl priority ({'/'.join(PRIORITY_STRATEGIES)}, default: {CRAWL_PRIORITY}): ").lower()
+        if not priority_input:
+            priority = CRAWL_PRIORITY
+            break
+        elif priority_input in PRIORITY_STRATEGIES:
+            priority = priority_input
+            break
+        else:
+            print(f"Invalid input. Please enter one of: {', '.join(PRIORITY_STRATEGIES)}.")
+
+    # Fetch the sitemap once so it can steer the crawl and be reused by the audit
+    sitemap_urls = None
+    if enable_sitemap_check:
+        sitemap_urls = fetch_sitemap(sitemap_url)
+    if priority == "sitemap" and not sitemap_urls:
+        print("No sitemap URLs available for sitemap priority. Falling back to depth priority.")
+        priority = "depth"
+
+    print(f"\nStarting SEO audit for {base_url} (max {max_pages} pages, {priority} priority)...")
     
-    crawled_data = crawl_site(base_url, max_pages)
+    crawled_data = crawl_site(base_url, max_pages, priority, sitemap_urls)
     
     if not crawled_data:
         print("Crawl failed. Could not retrieve any pages. Please check the BASE_URL and your network connection.")
@@ -63,7 +83,7 @@ def main():
     print(f"\nCrawl complete. Found {len(crawled_data)} pages.")
     print("Running SEO audit...")
     
-    issues = run_audit(crawled_data, max_pages, sitemap_url, enable_image_size_check, enable_sitemap_check)
+    issues = run_audit(crawled_data, max_pages, sitemap_url, enable_image_size_check, enable_sitemap_check, sitemap_urls)
     
     if not issues:
         print("Audit finished. No major issues found!")
@@ -76,8 +96,7 @@ def main():
     
     # Save raw data to CSV for detailed analysis
     try:
-        df = pd.DataFrame(crawled_data)
-        df.to_csv("seo_audit_raw_data.csv", index=False, encoding="utf-8-sig")
+        save_raw_data_csv(crawled_data, "seo_audit_raw_data.csv")
         print(f"Raw data for {len(crawled_data)} pages saved to seo_audit_raw_data.csv")
     except Exception as e:
         print(f"Could not save raw data CSV: {e}")
@@ -1,4 +1,3 @@
-import requests
 from collections import defaultdict
 from config import (
     TITLE_MIN_LENGTH, TITLE_MAX_LENGTH, META_DESC_MIN_LENGTH, 
@@ -8,26 +7,49 @@ from config import (
 )
 from crawler import fetch_sitemap
 
+# requests is imported inside the functions that send requests so that
+# importing this module stays cheap (see benchmarks/startup.py).
+
 HEADERS = {"User-Agent": "SEO-Audit-Bot/6.0"}
 
-def run_audit(crawled_data, max_links_to_check, sitemap_url=None, enable_image_size_check=False, enable_sitemap_check=False):
-    """Runs all SEO checks on the crawled data and returns a dictionary of issues."""
+def run_audit(crawled_data, max_links_to_check, sitemap_url=None, enable_image_size_check=False, enable_sitemap_check=False, sitemap_urls=None):
+    """
+    Runs all SEO checks on the crawled data and returns a dictionary of issues.
+    sitemap_urls can be passed to reuse a sitemap that was already fetched for the crawl.
+    """
+    import requests
     issues = {}
 
+    # Noindexed pages will never appear in search results, so content checks skip them
+    indexable_data = [p for p in crawled_data if not p.get('noindex')]
+
     # Prepare data for analysis
-    titles = {p['url']: p['title'] for p in crawled_data}
-    meta_descs = {p['url']: p['meta_descriptions'] for p in crawled_data}
-    h1s = {p['url']: p['h1s'] for p in crawled_data}
-    h2s = {p['url']: p['h2s'] for p in crawled_data}
-    word_counts = {p['url']: p['word_count'] for p in crawled_data}
-    canonicals = {p['url']: p['canonicals'] for p in crawled_data}
+    titles = {p['url']: p['title'] for p in indexable_data}
+    meta_descs = {p['url']: p['meta_descriptions'] for p in indexable_data}
+    h1s = {p['url']: p['h1s'] for p in indexable_data}
+    h2s = {p['url']: p['h2s'] for p in indexable_data}
+    word_counts = {p['url']: p['word_count'] for p in indexable_data}
+    canonicals = {p['url']: p['canonicals'] for p in indexable_data}
     images = {p['url']: p['images'] for p in crawled_data}
-    hreflangs = {p['url']: p['hreflangs'] for p in crawled_data}
+    hreflangs = {p['url']: p['hreflangs'] for p in indexable_data}
 
     # Convert crawled_data to a set of URLs for easy comparison
     crawled_urls = {p['url'] for p in crawled_data}
 
     # --- Run Checks ---
+    issues["Noindex_Pages"] = [
+        {"URL": p['url'], "Meta Robots": ", ".join(p.get('meta_robots', [])), "X-Robots-Tag": p.get('x_robots_tag', "")}
+        for p in crawled_data if p.get('noindex')
+    ]
+    issues["Invalid_Structured_Data"] = [
+        {"URL": p['url'], "Errors": p['structured_data_errors']}
+        for p in crawled_data if p.get('structured_data_errors')
+    ]
+    issues["Incomplete_Open_Graph"] = [
+        {"URL": p['url'], "Missing Tags": ", ".join(p['missing_open_graph'])}
+        for p in indexable_data if p.get('missing_open_graph')
+    ]
+
     issues["Missing_Title"] = [{"URL": url} for url, title in titles.items() if not title]
     issues["Short_Titles"] = [{"URL": url, "Title": title, "Length": len(title)} for url, title in titles.items() if title and len(title) < TITLE_MIN_LENGTH]
     issues["Long_Titles"] = [{"URL": url, "Title": title, "Length": len(title)} for url, title in titles.items() if len(title) > TITLE_MAX_LENGTH]
@@ -100,7 +122,9 @@ def run_audit(crawled_data, max_links_to_check, sitemap_url=None, enable_image_s
 
     # --- Sitemap Check ---
     if enable_sitemap_check and sitemap_url:
-        sitemap_urls = set(fetch_sitemap(sitemap_url))
+        if sitemap_urls is None:
+            sitemap_urls = fetch_sitemap(sitemap_url)
+        sitemap_urls = set(sitemap_urls)
         if sitemap_urls:
             sitemap_issues = check_sitemap_issues(crawled_urls, sitemap_urls, max_links_to_check)
             issues.update(sitemap_issues)
@@ -123,6 +147,7 @@ def check_urls_for_broken_links(urls_to_check, max_to_check, link_source="Page C
     urls_to_check can be a list of URLs or a dict of {url: [sources]}.
     link_source is used for reporting context (e.g., 'Page Content' or 'Sitemap').
     """
+    import requests
     broken_links = []
     is_dict = isinstance(urls_to_check, dict)
 
@@ -0,0 +1,208 @@
+"""
+A local HTTP server that serves a synthetic website for benchmarking the crawl/audit pipeline.
+
+Every page is generated on the fly from a site spec and a seed, so the same spec always
+produces the same site and nothing has to be written to disk or fetched from the internet.
+
+Usage (serve a site for manual testing):
+    python benchmarks/mock_site.py --preset medium --port 8000
+"""
+import argparse
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Shape of the synthetic site. All ratios are per page (or per image/link) probabilities.
+DEFAULT_SITE_SPEC = {
+    "seed": 42,
+    "pages": 200,
+    "fanout": 8,                  # Random internal links per page (plus a link to the next page)
+    "duplicate_title_ratio": 0.1, # Pages sharing the same title
+    "broken_link_ratio": 0.05,    # Pages with a link to a 404 URL
+    "images_per_page": 3,
+    "large_image_ratio": 0.2,     # Images reported above IMAGE_SIZE_THRESHOLD_KB
+    "missing_alt_ratio": 0.3,     # Images without an alt attribute
+    "heavy_page_ratio": 0.05,     # Pages padded with extra markup
+    "heavy_page_kb": 500,
+    "slow_page_ratio": 0.05,      # Pages that respond after slow_page_delay_ms
+    "slow_page_delay_ms": 200,
+    "rate_limited_ratio": 0.02,   # Pages that always answer 429 Too Many Requests
+    "sitemap_orphan_pages": 10,   # Pages listed in the sitemap but never linked
+    "sitemap_broken_urls": 5,     # Sitemap entries that return 404
+}
+
+SITE_PRESETS = {
+    "small": {"pages": 50},
+    "medium": {"pages": 500},
+    "large": {"pages": 5000, "slow_page_ratio": 0.01},
+}
+
+LARGE_IMAGE_BYTES = 300 * 1024
+SMALL_IMAGE_BYTES = 20 * 1024
+WORDS = ("search", "engine", "audit", "crawler", "content", "page", "index", "link", "title",
+         "meta", "heading", "image", "sitemap", "canonical", "structured", "data", "site", "rank")
+
+def build_spec(preset=None, **overrides):
+    """Returns a full site spec from the defaults, an optional preset and explicit overrides."""
+    spec = dict(DEFAULT_SITE_SPEC)
+    if preset:
+        spec.update(SITE_PRESETS[preset])
+    spec.update({key: value for key, value in overrides.items() if value is not None})
+    return spec
+
+def _rng(spec, *parts):
+    return random.Random(f"{spec['seed']}:" + ":".join(str(p) for p in parts))
+
+def page_flags(spec, index):
+    """Returns which special behaviours a page has. The home page is always a normal page."""
+    if index == 0:
+        return {"slow": False, "rate_limited": False, "heavy": False}
+    rng = _rng(spec, "flags", index)
+    return {
+        "slow": rng.random() < spec["slow_page_ratio"],
+        "rate_limited": rng.random() < spec["rate_limited_ratio"],
+        "heavy": rng.random() < spec["heavy_page_ratio"],
+    }
+
+def page_path(index):
+    return "/" if index == 0 else f"/page/{index}"
+
+def render_page(spec, index, base_url=""):
+    """Returns the HTML for one page of the synthetic site."""
+    rng = _rng(spec, "page", index)
+    pages = spec["pages"]
+
+    if rng.random() < spec["duplicate_title_ratio"]:
+        title = "Synthetic duplicate page title for benchmarks"
+    else:
+        title = f"Synthetic page {index} about {rng.choice(WORDS)} and {rng.choice(WORDS)}"
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+
+    targets = {(index + 1) % pages} | {rng.randrange(pages) for _ in range(spec["fanout"])}
+    links = [f'<a href="{page_path(t)}">{rng.choice(WORDS)} {t}</a>' for t in sorted(targets)]
+    if rng.random() < spec["broken_link_ratio"]:
+        links.append(f'<a href="/missing/{index}">broken link</a>')
+    links.append('<a href="https://external.invalid/">external</a>')
+
+    images = []
+    for k in range(spec["images_per_page"]):
+        size = "large" if rng.random() < spec["large_image_ratio"] else "small"
+        alt = "" if rng.random() < spec["missing_alt_ratio"] else f' alt="{rng.choice(WORDS)} image"'
+        images.append(f'<img src="/img/{size}/{index}-{k}.jpg"{alt}>')
+
+    paragraphs = [
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 120))) + "</p>"
+        for _ in range(rng.randint(1, 6))
+    ]
+    if page_flags(spec, index)["heavy"]:
+        block = '<div class="card"><span>' + " ".join(WORDS) + "</span></div>\n"
+        paragraphs.append(block * (spec["heavy_page_kb"] * 1024 // len(block)))
+
+    return f"""<!DOCTYPE html>
+<html><head>
+<title>{title}</title>
+<meta name="description" content="{description}">
+<link rel="canonical" href="{base_url}{page_path(index)}">
+</head><body>
+<h1>{title}</h1>
+<h2>Section {index}</h2>
+{"".join(paragraphs)}
+<nav>{" ".join(links)}</nav>
+{"".join(images)}
+</body></html>"""
+
+def render_sitemap(spec, base_url):
+    """Returns a sitemap listing every page, a few orphan pages and a few broken URLs."""
+    locs = [page_path(i) for i in range(spec["pages"])]
+    orphan_start = spec["pages"]
+    locs += [page_path(i) for i in range(orphan_start, orphan_start + spec["sitemap_orphan_pages"])]
+    locs += [f"/missing/sitemap-{i}" for i in range(spec["sitemap_broken_urls"])]
+    entries = "".join(f"<url><loc>{base_url}{loc}</loc></url>" for loc in locs)
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+def make_handler(spec):
+    """Builds a request handler class bound to a site spec."""
+    total_pages = spec["pages"] + spec["sitemap_orphan_pages"]
+
+    class MockSiteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass # Keep benchmark output clean
+
+        def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _route(self):
+            path = self.path.split("?", 1)[0].rstrip("/") or "/"
+            base_url = f"http://{self.headers.get('Host')}"
+            if path == "/sitemap.xml":
+                return self._send(200, render_sitemap(spec, base_url).encode("utf-8"), "application/xml")
+
+            if path.startswith("/img/"):
+                size = LARGE_IMAGE_BYTES if path.startswith("/img/large/") else SMALL_IMAGE_BYTES
+                return self._send(200, bytes(size), "image/jpeg")
+
+            if path == "/":
+                index = 0
+            elif path.startswith("/page/") and path[6:].isdigit():
+                index = int(path[6:])
+            else:
+                return self._send(404, b"<html><body>Not found</body></html>")
+            if index >= total_pages:
+                return self._send(404, b"<html><body>Not found</body></html>")
+
+            flags = page_flags(spec, index)
+            if flags["slow"]:
+                time.sleep(spec["slow_page_delay_ms"] / 1000)
+            if flags["rate_limited"]:
+                return self._send(429, b"<html><body>Too many requests</body></html>", headers={"Retry-After": "1"})
+            return self._send(200, render_page(spec, index, base_url).encode("utf-8"))
+
+        def do_GET(self):
+            self._route()
+
+        def do_HEAD(self):
+            self._route()
+
+    return MockSiteHandler
+
+def start_server(spec, host="127.0.0.1", port=0):
+    """Creates a threaded server for the spec. Port 0 picks a free port (see server.server_address)."""
+    server = ThreadingHTTPServer((host, port), make_handler(spec))
+    server.daemon_threads = True
+    return server
+
+def serve(spec, port_queue=None, host="127.0.0.1", port=0):
+    """Runs the server forever, reporting the bound port through port_queue if given."""
+    server = start_server(spec, host, port)
+    if port_queue is not None:
+        port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic website for benchmarking.")
+    parser.add_argument("--preset", choices=sorted(SITE_PRESETS), help="Site size preset.")
+    parser.add_argument("--pages", type=int, help="Number of linked pages.")
+    parser.add_argument("--seed", type=int, help="Seed for the generated content.")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    spec = build_spec(args.preset, pages=args.pages, seed=args.seed)
+    server = start_server(spec, port=args.port)
+    print(f"Serving a {spec['pages']}-page mock site at http://127.0.0.1:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+End-to-end throughput benchmark for the crawl -> audit -> report pipeline.
+
+A synthetic site (see mock_site.py) is served from a separate local process, so the
+benchmark runs fully offline and the server does not compete with the pipeline for the GIL.
+Each phase is timed separately and peak RSS is recorded after each phase.
+
+Usage:
+    python benchmarks/pipeline.py --preset medium --json results.json
+    python benchmarks/pipeline.py --preset medium --compare results.json --max-regression 0.2
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from mock_site import SITE_PRESETS, build_spec, render_page, serve
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MB, or None if unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+@contextlib.contextmanager
+def phase(results, name, verbose):
+    """Times a pipeline phase and records its latency and the peak RSS reached so far."""
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        yield
+    seconds = time.perf_counter() - start
+    results["phases"][name] = {"seconds": round(seconds, 4), "peak_rss_mb": peak_rss_mb()}
+    print(f"  {name:<8} {seconds:8.2f} s   peak RSS {results['phases'][name]['peak_rss_mb']} MB")
+
+def run_pipeline(spec, max_pages, verbose=False):
+    """Runs every phase against a freshly started mock site and returns the results dict."""
+    # Never let a proxy setting send local benchmark traffic off the machine
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+    os.environ["no_proxy"] = "127.0.0.1,localhost"
+
+    # Imported here so the import cost is not attributed to the first phase
+    from crawler import crawl_site
+    from parser import parse_page
+    from auditor import run_audit
+    from reporter import generate_xlsx_report, save_raw_data_csv
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(spec, port_queue), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=10)}/"
+    sitemap_url = f"{base_url}sitemap.xml"
+
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": spec,
+        "max_pages": max_pages,
+        "phases": {},
+    }
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            previous_cwd = os.getcwd()
+            os.chdir(workdir) # Reports are written to the current directory
+            try:
+                with phase(results, "crawl", verbose):
+                    crawled_data = crawl_site(base_url, max_pages, polite_pauses=False)
+
+                # Parse-only throughput, without any network time
+                html_pages = [render_page(spec, i, base_url.rstrip("/")) for i in range(min(max_pages, spec["pages"]))]
+                netloc = base_url.split("//", 1)[1].rstrip("/")
+                with phase(results, "parse", verbose):
+                    for i, html in enumerate(html_pages):
+                        parse_page(f"{base_url}page/{i}", html, netloc)
+
+                with phase(results, "audit", verbose):
+                    issues = run_audit(crawled_data, max_pages, sitemap_url, enable_image_size_check=True, enable_sitemap_check=True)
+
+                with phase(results, "report", verbose):
+                    if issues:
+                        generate_xlsx_report(issues, base_url, len(crawled_data))
+                    save_raw_data_csv(crawled_data)
+            finally:
+                os.chdir(previous_cwd)
+    finally:
+        server.terminate()
+        server.join()
+
+    phases = results["phases"]
+    results["pages_crawled"] = len(crawled_data)
+    results["issues_found"] = sum(len(v) for v in issues.values())
+    results["crawl_pages_per_sec"] = round(len(crawled_data) / phases["crawl"]["seconds"], 2) if phases["crawl"]["seconds"] else None
+    results["parse_pages_per_sec"] = round(len(html_pages) / phases["parse"]["seconds"], 2) if phases["parse"]["seconds"] else None
+    total_seconds = sum(p["seconds"] for name, p in phases.items() if name != "parse")
+    results["total_seconds"] = round(total_seconds, 4)
+    results["pipeline_pages_per_sec"] = round(len(crawled_data) / total_seconds, 2) if total_seconds else None
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+def compare(results, baseline, max_regression):
+    """Prints per-phase changes against a baseline and returns the phases that regressed."""
+    print(f"\nComparison with baseline from {baseline.get('timestamp', 'unknown')}:")
+    if baseline.get("spec") != results["spec"] or baseline.get("max_pages") != results["max_pages"]:
+        print("  Warning: the baseline used a different site spec or page limit.")
+
+    regressions = []
+    for name, current in results["phases"].items():
+        previous = baseline.get("phases", {}).get(name)
+        if not previous or not previous["seconds"]:
+            continue
+        change = (current["seconds"] - previous["seconds"]) / previous["seconds"]
+        flag = ""
+        if change > max_regression:
+            regressions.append(name)
+            flag = "  <-- REGRESSION"
+        print(f"  {name:<8} {previous['seconds']:8.2f} s -> {current['seconds']:8.2f} s  ({change:+.1%}){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawl/audit/report pipeline against a local mock site.")
+    parser.add_argument("--preset", choices=sorted(SITE_PRESETS), default="small", help="Site size preset.")
+    parser.add_argument("--pages", type=int, help="Override the number of pages in the site.")
+    parser.add_argument("--fanout", type=int, help="Override the number of random links per page.")
+    parser.add_argument("--seed", type=int, help="Override the content seed.")
+    parser.add_argument("--max-pages", type=int, help="Crawl budget (default: every page in the site).")
+    parser.add_argument("--json", help="Path to save the results as JSON.")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed slowdown per phase before failing (0.2 = 20%%).")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output.")
+    args = parser.parse_args()
+
+    spec = build_spec(args.preset, pages=args.pages, fanout=args.fanout, seed=args.seed)
+    max_pages = args.max_pages or spec["pages"]
+    print(f"Benchmarking a {spec['pages']}-page mock site (crawl budget {max_pages} pages)...")
+
+    results = run_pipeline(spec, max_pages, args.verbose)
+    print(f"\nPages crawled: {results['pages_crawled']}, issues found: {results['issues_found']}")
+    print(f"Crawl throughput: {results['crawl_pages_per_sec']} pages/sec")
+    print(f"Parse throughput: {results['parse_pages_per_sec']} pages/sec")
+    print(f"End-to-end throughput: {results['pipeline_pages_per_sec']} pages/sec")
+    print(f"Peak RSS: {results['peak_rss_mb']} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\nFAIL: {', '.join(regressions)} slowed down by more than {args.max_regression:.0%}.")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Measures how long the CLI takes to get from interpreter start to its first HTTP request.
+
+A small page is served from a local http.server. Each run starts a fresh interpreter that
+imports the app and calls crawler.crawl_page on that page, exactly as the first page of a
+crawl is fetched. The server records when the first request (the HEAD check) arrives, so
+the budgeted number covers every import on that path, requests included. The time until
+crawl_page has downloaded and parsed the page is reported as well.
+It also runs the same code under `python -X importtime` and lists the slowest modules.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--budget-ms 200] [--top 15] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = b"<html><head><title>Startup benchmark</title></head><body><a href='/next'>next</a></body></html>"
+# What the CLI does before and during the first page of a crawl
+FIRST_PAGE_CODE = (
+    "import sys, app, crawler; "
+    "crawler.crawl_page(sys.argv[1], sys.argv[1].split('//', 1)[1].rstrip('/'))"
+)
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves PAGE for every path and records when each request arrives."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        self.server.request_times.append(time.perf_counter())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(PAGE)
+
+    do_GET = _respond
+    do_HEAD = _respond
+
+def start_server():
+    """Starts the local page server in a background thread and returns it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.request_times = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def child_env():
+    """Environment for the measured interpreter; local traffic must never go through a proxy."""
+    env = dict(os.environ)
+    env["NO_PROXY"] = env["no_proxy"] = "127.0.0.1,localhost"
+    return env
+
+def time_startup(runs, server, url):
+    """
+    Returns two lists of wall-clock times (ms) from starting Python:
+    until the server received the first request, and until the first page was crawled.
+    """
+    first_request, first_page = [], []
+    for _ in range(runs):
+        server.request_times.clear()
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", FIRST_PAGE_CODE, url], cwd=REPO_ROOT, env=child_env(),
+                       check=True, stdout=subprocess.DEVNULL)
+        end = time.perf_counter()
+        if not server.request_times:
+            sys.exit("The measured process never reached the local server.")
+        first_request.append((server.request_times[0] - start) * 1000)
+        first_page.append((end - start) * 1000)
+    return first_request, first_page
+
+def import_profile(url):
+    """Runs the first-page code under -X importtime and returns [(module, self_us, cumulative_us)]."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", FIRST_PAGE_CODE, url],
+        cwd=REPO_ROOT, env=child_env(), check=True, capture_output=True, text=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        modules.append((module.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time.")
+    parser.add_argument("--runs", type=int, default=10, help="Number of timed interpreter starts.")
+    parser.add_argument("--budget-ms", type=float, default=200, help="Fail if the median time to the first request exceeds this.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list.")
+    parser.add_argument("--json", help="Optional path to save the results as JSON.")
+    args = parser.parse_args()
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        first_request, first_page = time_startup(args.runs, server, url)
+        modules = import_profile(url)
+    finally:
+        server.shutdown()
+
+    median_ms = statistics.median(first_request)
+    page_ms = statistics.median(first_page)
+    print(f"Startup to first request over {args.runs} runs: median {median_ms:.1f} ms, "
+          f"min {min(first_request):.1f} ms, max {max(first_request):.1f} ms")
+    print(f"Startup to first page crawled (HEAD, GET and parse): median {page_ms:.1f} ms")
+
+    app_us = next((cumulative for name, _self, cumulative in modules if name == "app"), 0)
+    print(f"Cumulative import time of app: {app_us / 1000:.1f} ms")
+    heavy = [name for name in ("pandas", "openpyxl") if any(m[0] == name for m in modules)]
+    if heavy:
+        print(f"Warning: report-only modules loaded before the first page: {', '.join(heavy)}")
+
+    print(f"\nSlowest {args.top} imports (cumulative):")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "first_request_ms": first_request,
+                "median_ms": median_ms,
+                "first_page_ms": first_page,
+                "first_page_median_ms": page_ms,
+                "budget_ms": args.budget_ms,
+                "app_import_ms": app_us / 1000,
+                "heavy_modules": heavy,
+            }, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+    if median_ms > args.budget_ms:
+        print(f"\nFAIL: median time to first request {median_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget.")
+        sys.exit(1)
+    print(f"\nOK: within the {args.budget_ms:.0f} ms budget.")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,29 @@ H1_MAX_LENGTH = 70
 H2_MAX_LENGTH = 150
 LOW_WORD_COUNT_THRESHOLD = 300 # For blog posts or important pages
 IMAGE_SIZE_THRESHOLD_KB = 100 # Images larger than this (in KB) will be flagged
+REQUIRED_OPEN_GRAPH_TAGS = ("og:title", "og:type", "og:image", "og:url") # Minimum set for a complete social preview
+ROBOTS_USER_AGENTS = ("seo-audit-bot", "googlebot") # Robots directives aimed at these bots (or at all bots) are obeyed
+
+# --- CRAWL FRONTIER ---
+CRAWL_PRIORITY = "depth" # "depth", "sitemap" (sitemap URLs first) or "inlinks" (most linked-to first)
+IGNORED_QUERY_PARAMS = {"gclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid", "phpsessid", "sessionid", "jsessionid", "sid"}
+IGNORED_QUERY_PARAM_PREFIXES = ("utm_",) # Tracking parameters stripped from every URL
+MAX_PATH_DEPTH = 12 # URLs with more path segments than this are treated as crawler traps
+MAX_PATH_SEGMENT_REPEATS = 3 # A path segment repeated more than this (e.g. /a/b/a/b/a/b/a) is a trap
+MAX_QUERY_PARAMS = 5 # URLs with more query parameters than this are treated as faceted-navigation traps
+MAX_QUERY_VARIANTS_PER_PATH = 25 # Distinct query strings allowed for the same path before it is a trap
+VISITED_EXACT_LIMIT = 100000 # Visited URLs kept in an exact set before switching to a Bloom filter
+VISITED_BLOOM_CAPACITY = 5000000 # Expected number of URLs the Bloom filter is sized for
+VISITED_BLOOM_ERROR_RATE = 0.001 # Acceptable false-positive rate (a false positive skips a page)
+MAX_PENDING_URLS = 200000 # Queued URLs kept in memory; past this the lowest-priority ones are dropped
+
+# --- DISTRIBUTED CRAWL ---
+DISTRIBUTED_PORT = 8765 # Port the coordinator listens on for workers
+DISTRIBUTED_BATCH_SIZE = 20 # URLs a worker leases at a time
+DISTRIBUTED_LEASE_SECONDS = 300 # Leased URLs return to the frontier if not completed in time (e.g. worker crashed)
+DISTRIBUTED_RPC_TIMEOUT = 60 # Seconds a worker waits for a single coordinator call before retrying
+DISTRIBUTED_UNREACHABLE_SECONDS = 300 # Workers keep retrying for this long before giving up on the coordinator
+DISTRIBUTED_TOKEN_ENV = "SEO_AUDIT_CRAWL_TOKEN" # Environment variable holding the shared coordinator token
 
 # --- ISSUE DEFINITIONS --- 
 # This dictionary maps internal issue keys to their descriptions for the report.
@@ -132,6 +155,23 @@ ISSUE_DETAILS = {
         "description": "Issue: Potential problems with hreflang implementation (e.g., incorrect syntax, broken URLs, missing return tags). This requires manual inspection.",
         "recommendation": "Recommendation: Manually verify the hreflang implementation using Google Search Console or a third-party tool. Ensure all URLs are valid, self-referencing, and have reciprocal links."
     },
+    # Indexability
+    "Noindex_Pages": {
+        "sheet_name": "Noindex Pages",
+        "description": "Issue: These pages ask search engines not to index them (meta robots or X-Robots-Tag). Content checks are skipped for them.",
+        "recommendation": "Recommendation: Confirm each page is meant to be excluded from search results. Remove the noindex directive from any page that should rank."
+    },
+    # Structured Data & Social
+    "Invalid_Structured_Data": {
+        "sheet_name": "Invalid Structured Data",
+        "description": "Issue: These pages contain JSON-LD blocks that could not be parsed, so search engines will ignore them.",
+        "recommendation": "Recommendation: Fix the JSON syntax and validate the markup with Google's Rich Results Test."
+    },
+    "Incomplete_Open_Graph": {
+        "sheet_name": "Incomplete Open Graph",
+        "description": f"Issue: These pages are missing one or more of the core Open Graph tags ({', '.join(REQUIRED_OPEN_GRAPH_TAGS)}).",
+        "recommendation": "Recommendation: Add the missing Open Graph tags so links shared on social platforms show a proper title, image and description."
+    },
     # Broken Links
     "Broken_Links": {
         "sheet_name": "Broken Links 4xx-5xx",
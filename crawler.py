@@ -1,16 +1,19 @@
-import requests
 import time
 import random 
-from collections import deque
 from urllib.parse import urlparse
-from parser import parse_page
+from parser import parse_page, parse_robots_directives
+from frontier import Frontier
+from config import CRAWL_PRIORITY
 from utils import normalize_url
-import xml.etree.ElementTree as ET
+
+# requests and the XML parser are imported inside the functions that use them
+# so that importing this module stays cheap (see benchmarks/startup.py).
 
 HEADERS = {"User-Agent": "SEO-Audit-Bot/6.0"}
 
 def fetch(url):
     """Performs a GET request, handles errors, and returns the final URL, status, and text."""
+    import requests
     try:
         r = requests.get(url, headers=HEADERS, timeout=10, allow_redirects=True)
         r.raise_for_status()
@@ -19,70 +22,109 @@ def fetch(url):
         print(f"  -> Error fetching {url}: {e}")
         return url, None, None
 
-def crawl_site(base_url, max_pages):
-    """Crawls a website, fetching only HTML pages, and returns the parsed data."""
+def crawl_site(base_url, max_pages, priority=CRAWL_PRIORITY, sitemap_urls=None, polite_pauses=True):
+    """
+    Crawls a website, fetching only HTML pages, and returns the parsed data.
+    priority decides which discovered pages get the max_pages budget first
+    ("depth", "sitemap" or "inlinks"); sitemap_urls is used by the "sitemap" strategy.
+    polite_pauses can be disabled for local sites (e.g. benchmarks) that never block the crawler.
+    """
     crawled_data = []
     start_url = normalize_url(base_url)
-    queue = deque([start_url])
-    visited = {start_url}
+    frontier = Frontier(priority, sitemap_urls)
+    frontier.add(start_url, check_traps=False)
     base_netloc = urlparse(start_url).netloc.replace("www.", "")
 
     next_pause_at = random.randint(50, 100)
     
-    while queue and len(crawled_data) < max_pages:
-        url = queue.popleft()
+    while frontier and len(crawled_data) < max_pages:
+        url, depth = frontier.pop()
         print(f"Crawling [{len(crawled_data) + 1}/{max_pages}]: {url}")
 
-        if len(crawled_data) > 0 and (len(crawled_data) % 100 == 0 or len(crawled_data) == next_pause_at):
+        if polite_pauses and len(crawled_data) > 0 and (len(crawled_data) % 100 == 0 or len(crawled_data) == next_pause_at):
             wait_time = random.randint(50, 80) 
             print(f"Pausing for {wait_time // 60} minutes ({wait_time} seconds) to avoid being blocked...")
             time.sleep(wait_time)
             next_pause_at = len(crawled_data) + random.randint(30, 80)
 
-        try:
-            head_response = requests.head(url, headers=HEADERS, timeout=5, allow_redirects=True)
-            content_type = head_response.headers.get("Content-Type", "")
-            final_url = normalize_url(head_response.url)
-            final_netloc = urlparse(final_url).netloc.replace("www.", "")
-
-            if final_url in visited and final_url != url:
-                print(f"  -> Redirected to already visited page: {final_url}")
-                continue
-            
-            if final_netloc != base_netloc:
-                print(f"  -> Skipping {final_url}: Redirected outside base domain.")
-                visited.add(final_url) # Mark as visited so we don't check it again
-                continue
-
-            if "text/html" not in content_type:
-                print(f"  -> Skipping non-HTML content: {content_type}")
-                visited.add(final_url) # Mark as visited so we don't check it again
-                continue
-
-        except requests.RequestException as e:
-            print(f"  -> Could not perform HEAD request for {url}: {e}")
-            continue
-
-        # Now we know it's an HTML page, so we fetch the full content
-        # The final_url from the HEAD request is the one we use
-        _final_url, status, html = fetch(final_url)
-        if not html:
+        final_url, page_data = crawl_page(url, base_netloc, frontier.is_visited)
+        if final_url:
+            frontier.mark_visited(final_url) # Mark as visited so we don't check it again
+        if page_data is None:
             continue
-        
-        visited.add(final_url)
-
-        page_data = parse_page(final_url, html, base_netloc)
         crawled_data.append(page_data)
 
-        for link in page_data["internal_links"]:
-            if link not in visited:
-                visited.add(link)
-                queue.append(link)
+        for link in links_to_follow(page_data):
+            frontier.add(link, depth + 1)
+
+    if frontier.dropped_count:
+        print(f"Dropped {frontier.dropped_count} low-priority URLs because the frontier reached {frontier.max_pending} queued URLs.")
+    if frontier.trap_count:
+        print(f"Skipped {frontier.trap_count} URLs that looked like crawler traps.")
     
     return crawled_data
 
+def crawl_page(url, base_netloc, is_visited=None):
+    """
+    HEAD-checks a URL and, if it is an internal HTML page worth downloading, fetches and parses it.
+    is_visited is called with the final URL after redirects to avoid re-crawling known pages.
+    Returns (final_url, page_data). page_data is None when the page was skipped, and
+    final_url is None when the URL could not be reached at all.
+    """
+    import requests
+
+    try:
+        head_response = requests.head(url, headers=HEADERS, timeout=5, allow_redirects=True)
+        head_headers = head_response.headers
+        content_type = head_headers.get("Content-Type", "")
+        final_url = normalize_url(head_response.url)
+        final_netloc = urlparse(final_url).netloc.replace("www.", "")
+
+        if final_url != url and is_visited is not None and is_visited(final_url):
+            print(f"  -> Redirected to already visited page: {final_url}")
+            return final_url, None
+
+        if final_netloc != base_netloc:
+            print(f"  -> Skipping {final_url}: Redirected outside base domain.")
+            return final_url, None
+
+        if "text/html" not in content_type:
+            print(f"  -> Skipping non-HTML content: {content_type}")
+            return final_url, None
+
+        # A page that is neither indexable nor followable is not worth downloading
+        header_directives = set(parse_robots_directives(head_headers.get("X-Robots-Tag", "")))
+        if "none" in header_directives or {"noindex", "nofollow"} <= header_directives:
+            print(f"  -> Not downloading {final_url}: X-Robots-Tag is noindex, nofollow.")
+            # Still record the page (with no content) so it is reported as noindex
+            # rather than missing from the crawl
+            return final_url, parse_page(final_url, "", base_netloc, head_headers)
+
+    except requests.RequestException as e:
+        print(f"  -> Could not perform HEAD request for {url}: {e}")
+        return None, None
+
+    # Now we know it's an HTML page, so we fetch the full content
+    # The final_url from the HEAD request is the one we use
+    _final_url, status, html = fetch(final_url)
+    if not html:
+        return None, None
+
+    return final_url, parse_page(final_url, html, base_netloc, head_headers)
+
+def links_to_follow(page_data):
+    """Returns the internal links of a parsed page that the crawler may follow, respecting nofollow."""
+    if page_data["nofollow"]:
+        print("  -> Page is nofollow, not following its links.")
+        return []
+    nofollow_links = set(page_data["nofollow_links"])
+    return [link for link in page_data["internal_links"] if link not in nofollow_links]
+
 def fetch_sitemap(sitemap_url):
     """Downloads and parses a sitemap.xml file, returning a list of URLs."""
+    import requests
+    import xml.etree.ElementTree as ET
+
     print(f"Fetching sitemap from: {sitemap_url}")
     urls = set()
     try:
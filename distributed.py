@@ -0,0 +1,417 @@
+"""
+Distributed crawl mode for very large sites.
+
+A single coordinator owns the frontier, the visited set and the crawled pages, all stored
+in a SQLite database so a crawl survives restarts. Workers on one or more machines talk to
+the coordinator over XML-RPC: they lease batches of URLs, crawl and parse them with the
+same code as crawl_site, and send the parsed records back.
+
+- Leases expire after DISTRIBUTED_LEASE_SECONDS, so URLs held by a crashed worker are
+  handed out again.
+- Pages are keyed by their final URL, so each page is recorded exactly once even if a
+  slow worker and its replacement both complete the same URL.
+- crawled_data() returns records in the same format as crawl_site, ready for run_audit.
+- The coordinator only listens on localhost unless --host is given, and then every call
+  must carry the shared token, so strangers cannot lease URLs or submit fake pages.
+
+Usage:
+    export SEO_AUDIT_CRAWL_TOKEN=<shared secret>
+    python distributed.py coordinator --base-url https://example.com --max-pages 500000 --db crawl.sqlite --host 0.0.0.0
+    python distributed.py worker --coordinator http://coordinator-host:8765 --processes 4
+"""
+import argparse
+import hmac
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from urllib.parse import urlparse
+from xmlrpc.client import ServerProxy, Transport, Error as XMLRPCError
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCRequestHandler
+from config import (
+    CRAWL_PRIORITY, DISTRIBUTED_PORT, DISTRIBUTED_BATCH_SIZE, DISTRIBUTED_LEASE_SECONDS,
+    DISTRIBUTED_RPC_TIMEOUT, DISTRIBUTED_UNREACHABLE_SECONDS, DISTRIBUTED_TOKEN_ENV
+)
+from crawler import crawl_page, links_to_follow, fetch_sitemap
+from frontier import PRIORITY_STRATEGIES, TrapDetector
+from utils import normalize_url
+
+TOKEN_HEADER = "X-Crawl-Token"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Frontier ordering for each priority strategy; rowid keeps discovery order as the tie-breaker
+PRIORITY_ORDER = {
+    "depth": "depth, rowid",
+    "sitemap": "in_sitemap DESC, depth, rowid",
+    "inlinks": "inlinks DESC, depth, rowid",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    depth INTEGER NOT NULL,
+    in_sitemap INTEGER NOT NULL DEFAULT 0,
+    inlinks INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending', -- pending, leased, done or trap
+    lease_id TEXT,
+    lease_expires REAL,
+    reason TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class Coordinator:
+    """Shared frontier, visited set and result sink for distributed crawl workers."""
+
+    def __init__(self, db_path, base_url, max_pages, priority=CRAWL_PRIORITY, sitemap_urls=None,
+                 lease_seconds=DISTRIBUTED_LEASE_SECONDS):
+        if priority not in PRIORITY_STRATEGIES:
+            raise ValueError(f"Unknown crawl priority '{priority}'. Use one of: {', '.join(PRIORITY_STRATEGIES)}")
+        self.base_url = base_url
+        self.start_url = normalize_url(base_url)
+        self.base_netloc = urlparse(self.start_url).netloc.replace("www.", "")
+        self.max_pages = max_pages
+        self.priority = priority
+        self.sitemap_urls = set(sitemap_urls or [])
+        self.lease_seconds = lease_seconds
+        self.trap_detector = TrapDetector()
+
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"CREATE INDEX IF NOT EXISTS frontier_{priority} ON frontier (state, {PRIORITY_ORDER[priority].replace(', rowid', '')})")
+        with self.db:
+            stored = self.db.execute("SELECT value FROM settings WHERE key = 'start_url'").fetchone()
+            if stored and stored[0] != self.start_url:
+                raise ValueError(f"{db_path} belongs to a crawl of {stored[0]}, not {self.start_url}")
+            self.db.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('start_url', ?)", (self.start_url,))
+            self.db.execute(
+                "INSERT OR IGNORE INTO frontier (url, depth, in_sitemap) VALUES (?, 0, ?)",
+                (self.start_url, int(self.start_url in self.sitemap_urls))
+            )
+        self.page_count = self.db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        # Query-variant counts are kept in memory, so rebuild them when resuming. Only links
+        # (inlinks > 0) went through the detector; the start URL and redirect targets did not.
+        self.trap_detector.restore(url for (url,) in self.db.execute(
+            "SELECT url FROM frontier WHERE state != 'trap' AND inlinks > 0 AND url LIKE '%?%'"
+        ))
+
+    def settings(self):
+        """Returns what a worker needs to know about this crawl."""
+        return {"base_netloc": self.base_netloc, "max_pages": self.max_pages}
+
+    def _expire_leases(self):
+        expired = self.db.execute(
+            "UPDATE frontier SET state = 'pending', lease_id = NULL, lease_expires = NULL "
+            "WHERE state = 'leased' AND lease_expires < ?", (time.time(),)
+        ).rowcount
+        if expired:
+            print(f"  -> Returned {expired} URLs from expired leases to the frontier.")
+
+    def lease(self, worker_id, batch_size=DISTRIBUTED_BATCH_SIZE):
+        """
+        Hands out up to batch_size URLs in priority order.
+        Returns {"lease_id", "urls": [[url, depth], ...], "finished"}.
+        """
+        with self.db:
+            self._expire_leases()
+            if self.finished():
+                return {"lease_id": None, "urls": [], "finished": True}
+
+            leased = self.db.execute("SELECT COUNT(*) FROM frontier WHERE state = 'leased'").fetchone()[0]
+            budget = min(batch_size, self.max_pages - self.page_count - leased)
+            if budget <= 0:
+                return {"lease_id": None, "urls": [], "finished": False}
+
+            rows = self.db.execute(
+                f"SELECT url, depth FROM frontier WHERE state = 'pending' ORDER BY {PRIORITY_ORDER[self.priority]} LIMIT ?",
+                (budget,)
+            ).fetchall()
+            if not rows:
+                return {"lease_id": None, "urls": [], "finished": False}
+
+            lease_id = uuid.uuid4().hex
+            self.db.executemany(
+                "UPDATE frontier SET state = 'leased', lease_id = ?, lease_expires = ? WHERE url = ?",
+                [(lease_id, time.time() + self.lease_seconds, url) for url, _depth in rows]
+            )
+        print(f"Leased {len(rows)} URLs to {worker_id} ({self.page_count}/{self.max_pages} pages recorded).")
+        return {"lease_id": lease_id, "urls": [list(row) for row in rows], "finished": False}
+
+    def complete(self, lease_id, results):
+        """
+        Records the outcome of a leased batch. Each result is {"url", "final_url", "page"}, where
+        final_url is where the URL redirected to (None if unreachable) and page is the parse_page
+        record serialized as a JSON string, or None if the URL was skipped.
+        Results for URLs no longer held by lease_id are ignored: the lease expired and the
+        URL was handed to another worker, which will report it.
+        Returns the number of pages newly recorded.
+        """
+        recorded = 0
+        stale = 0
+        with self.db:
+            for result in results:
+                url, final_url, page_json = result["url"], result.get("final_url"), result.get("page")
+                row = self.db.execute("SELECT depth, state, lease_id FROM frontier WHERE url = ?", (url,)).fetchone()
+                # Accept the result if this lease still holds the URL, or if its expired lease
+                # returned it to the frontier and nobody else has leased it since
+                if row is None or (row[2] != lease_id and row[1] != "pending"):
+                    stale += 1
+                    continue
+                depth = row[0]
+                self._mark_done(url)
+                if final_url and final_url != url:
+                    # The worker already checked the redirect target (and fetched it unless it was
+                    # skipped), so it must not be leased again, as crawl_site does with mark_visited
+                    self.db.execute("INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)", (final_url, depth))
+                    self.db.execute("UPDATE frontier SET state = 'done' WHERE url = ? AND state = 'pending'", (final_url,))
+
+                if page_json is None or self.page_count >= self.max_pages:
+                    continue
+                page = json.loads(page_json)
+                # The UNIQUE url column makes recording idempotent across retried leases
+                inserted = self.db.execute(
+                    "INSERT OR IGNORE INTO pages (url, data) VALUES (?, ?)", (page["url"], page_json)
+                ).rowcount
+                if not inserted:
+                    continue
+                self.page_count += 1
+                recorded += 1
+                for link in links_to_follow(page):
+                    self._add_link(link, depth + 1)
+        if stale:
+            print(f"  -> Ignored {stale} results from an expired lease.")
+        return recorded
+
+    def _mark_done(self, url):
+        self.db.execute("UPDATE frontier SET state = 'done', lease_id = NULL, lease_expires = NULL WHERE url = ?", (url,))
+
+    def _add_link(self, url, depth):
+        if self.db.execute("SELECT 1 FROM frontier WHERE url = ?", (url,)).fetchone():
+            if self.priority == "inlinks":
+                self.db.execute("UPDATE frontier SET inlinks = inlinks + 1 WHERE url = ? AND state = 'pending'", (url,))
+            return
+        reason = self.trap_detector.check(url)
+        self.db.execute(
+            "INSERT INTO frontier (url, depth, in_sitemap, inlinks, state, reason) VALUES (?, ?, ?, 1, ?, ?)",
+            (url, depth, int(url in self.sitemap_urls), "trap" if reason else "pending", reason)
+        )
+
+    def is_visited(self, url):
+        """True if the URL is being crawled or has been crawled. Queued URLs do not count,
+        so a worker redirected to a pending URL fetches it instead of skipping it."""
+        return self.db.execute(
+            "SELECT 1 FROM frontier WHERE url = ? AND state IN ('leased', 'done')", (url,)
+        ).fetchone() is not None
+
+    def finished(self):
+        if self.page_count >= self.max_pages:
+            return True
+        return self.db.execute(
+            "SELECT 1 FROM frontier WHERE state IN ('pending', 'leased') LIMIT 1"
+        ).fetchone() is None
+
+    def status(self):
+        counts = dict(self.db.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall())
+        return {"pages_recorded": self.page_count, "max_pages": self.max_pages, "frontier": counts}
+
+    def crawled_data(self):
+        """Returns the recorded pages in crawl order, in the same format crawl_site returns."""
+        return [json.loads(data) for (data,) in self.db.execute("SELECT data FROM pages ORDER BY seq")]
+
+    def close(self):
+        self.db.close()
+
+class TokenRequestHandler(SimpleXMLRPCRequestHandler):
+    """Rejects calls that do not carry the server's shared token."""
+
+    def do_POST(self):
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+            self.send_error(403, "Missing or wrong crawl token")
+            return
+        super().do_POST()
+
+class CoordinatorServer(SimpleXMLRPCServer):
+    """XML-RPC server with a connection backlog large enough for many workers."""
+    # The single-threaded server answers one call at a time; other workers wait in the backlog
+    request_queue_size = 128
+
+def serve_coordinator(coordinator, host="127.0.0.1", port=DISTRIBUTED_PORT, grace_seconds=10, token=None):
+    """
+    Serves the coordinator to workers until the crawl is finished.
+    When token is set, calls without the same token are rejected.
+    """
+    server = CoordinatorServer((host, port), requestHandler=TokenRequestHandler, allow_none=True, logRequests=False)
+    server.token = token
+    for method in (coordinator.settings, coordinator.lease, coordinator.complete,
+                   coordinator.is_visited, coordinator.status):
+        server.register_function(method)
+    server.timeout = 1
+    print(f"Coordinator listening on {host}:{port} for workers...")
+    try:
+        while not coordinator.finished():
+            server.handle_request()
+        # Keep answering briefly so idle workers learn that the crawl is finished
+        deadline = time.time() + grace_seconds
+        while time.time() < deadline:
+            server.handle_request()
+    finally:
+        server.server_close()
+
+class TimeoutTransport(Transport):
+    """XML-RPC transport that sends the crawl token and times out instead of waiting forever."""
+
+    def __init__(self, timeout=DISTRIBUTED_RPC_TIMEOUT, token=None):
+        super().__init__(headers=[(TOKEN_HEADER, token)] if token else [])
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+def call_with_retry(worker_id, method, *args, unreachable_seconds=DISTRIBUTED_UNREACHABLE_SECONDS):
+    """
+    Calls a coordinator method, retrying with exponential backoff while the coordinator is
+    unreachable (refused or reset connections, timeouts). Gives up by re-raising once it has
+    been unreachable for more than unreachable_seconds.
+    """
+    delay = 1
+    first_failure = None
+    while True:
+        try:
+            return method(*args)
+        except (OSError, http.client.HTTPException) as e:
+            first_failure = first_failure or time.time()
+            if time.time() - first_failure > unreachable_seconds:
+                raise
+            print(f"[{worker_id}] Coordinator unreachable ({e}), retrying in {delay} s...")
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+def run_worker(coordinator_url, worker_id=None, batch_size=DISTRIBUTED_BATCH_SIZE, idle_seconds=2,
+               rpc_timeout=DISTRIBUTED_RPC_TIMEOUT, unreachable_seconds=DISTRIBUTED_UNREACHABLE_SECONDS, token=None):
+    """Leases URLs from the coordinator and crawls them until the crawl is finished."""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    coordinator = ServerProxy(coordinator_url, transport=TimeoutTransport(rpc_timeout, token), allow_none=True)
+
+    def call(method, *args):
+        return call_with_retry(worker_id, method, *args, unreachable_seconds=unreachable_seconds)
+
+    def is_visited(url):
+        return call(coordinator.is_visited, url)
+
+    recorded = 0
+    try:
+        base_netloc = call(coordinator.settings)["base_netloc"]
+        while True:
+            lease = call(coordinator.lease, worker_id, batch_size)
+            if lease["finished"]:
+                break
+            if not lease["urls"]:
+                # Other workers still hold leases that may add new links
+                time.sleep(idle_seconds)
+                continue
+
+            try:
+                results = []
+                for url, _depth in lease["urls"]:
+                    print(f"[{worker_id}] Crawling: {url}")
+                    final_url, page_data = crawl_page(url, base_netloc, is_visited)
+                    # Sent as JSON because XML-RPC cannot carry control characters found in some pages
+                    results.append({
+                        "url": url, "final_url": final_url, "page": json.dumps(page_data) if page_data else None
+                    })
+                # Safe to retry: completing the same URLs twice records each page once
+                recorded += call(coordinator.complete, lease["lease_id"], results)
+            except XMLRPCError as e:
+                # A coordinator-side error affects only this batch; its URLs are re-leased on expiry
+                print(f"[{worker_id}] Coordinator rejected batch {lease['lease_id']}: {e}")
+    except (OSError, http.client.HTTPException) as e:
+        print(f"[{worker_id}] Gave up on coordinator at {coordinator_url} after {unreachable_seconds} s: {e}")
+    except XMLRPCError as e:
+        print(f"[{worker_id}] Coordinator at {coordinator_url} refused this worker: {e}")
+    print(f"[{worker_id}] Finished. Recorded {recorded} pages.")
+    return recorded
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed SEO crawl.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    coord = subparsers.add_parser("coordinator", help="Run the coordinator, then audit the merged results.")
+    coord.add_argument("--base-url", required=True)
+    coord.add_argument("--max-pages", type=int, required=True)
+    coord.add_argument("--db", default="crawl.sqlite", help="SQLite file holding the crawl state (reused to resume).")
+    coord.add_argument("--host", default="127.0.0.1",
+                       help=f"Interface to listen on. Anything but localhost requires a shared token in ${DISTRIBUTED_TOKEN_ENV}.")
+    coord.add_argument("--port", type=int, default=DISTRIBUTED_PORT)
+    coord.add_argument("--priority", choices=PRIORITY_STRATEGIES, default=CRAWL_PRIORITY)
+    coord.add_argument("--sitemap-url", help="Sitemap used for sitemap priority and the sitemap check.")
+    coord.add_argument("--lease-seconds", type=int, default=DISTRIBUTED_LEASE_SECONDS)
+    coord.add_argument("--image-size-check", action="store_true")
+
+    worker = subparsers.add_parser("worker", help="Run crawl workers against a coordinator.")
+    worker.add_argument("--coordinator", default=f"http://127.0.0.1:{DISTRIBUTED_PORT}")
+    worker.add_argument("--processes", type=int, default=1)
+    worker.add_argument("--batch-size", type=int, default=DISTRIBUTED_BATCH_SIZE)
+
+    args = parser.parse_args()
+    # Read from the environment so the secret does not show up in the process list
+    token = os.environ.get(DISTRIBUTED_TOKEN_ENV)
+
+    if args.command == "worker":
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(args.coordinator, None, args.batch_size),
+                                    kwargs={"token": token})
+            for _ in range(args.processes)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        return
+
+    if args.host not in LOCAL_HOSTS and not token:
+        parser.error(f"Set {DISTRIBUTED_TOKEN_ENV} to a shared secret before listening on {args.host}; "
+                     "otherwise anyone who can reach the port can submit pages.")
+
+    sitemap_urls = fetch_sitemap(args.sitemap_url) if args.sitemap_url else None
+    coordinator = Coordinator(args.db, args.base_url, args.max_pages, args.priority, sitemap_urls, args.lease_seconds)
+    serve_coordinator(coordinator, args.host, args.port, token=token)
+    crawled_data = coordinator.crawled_data()
+    print(f"\nDistributed crawl complete. {coordinator.status()}")
+    coordinator.close()
+
+    if not crawled_data:
+        print("Crawl failed. Could not retrieve any pages.")
+        return
+
+    # Imported here so workers never pay for the audit and report dependencies
+    from auditor import run_audit
+    from reporter import generate_xlsx_report, save_raw_data_csv
+
+    print("Running SEO audit...")
+    issues = run_audit(crawled_data, args.max_pages, args.sitemap_url, args.image_size_check,
+                       bool(args.sitemap_url), sitemap_urls)
+    if issues:
+        print(f"Audit complete. Found {sum(len(v) for v in issues.values())} total issues.")
+        generate_xlsx_report(issues, args.base_url, len(crawled_data))
+    else:
+        print("Audit finished. No major issues found!")
+    save_raw_data_csv(crawled_data, "seo_audit_raw_data.csv")
+    print(f"Raw data for {len(crawled_data)} pages saved to seo_audit_raw_data.csv")
+
+if __name__ == "__main__":
+    main()
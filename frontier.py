@@ -0,0 +1,213 @@
+import hashlib
+import heapq
+import math
+from collections import Counter, defaultdict
+from urllib.parse import urlparse, parse_qsl
+from config import (
+    CRAWL_PRIORITY, MAX_PATH_DEPTH, MAX_PATH_SEGMENT_REPEATS,
+    MAX_QUERY_PARAMS, MAX_QUERY_VARIANTS_PER_PATH, MAX_PENDING_URLS,
+    VISITED_EXACT_LIMIT, VISITED_BLOOM_CAPACITY, VISITED_BLOOM_ERROR_RATE
+)
+
+PRIORITY_STRATEGIES = ("depth", "sitemap", "inlinks")
+
+class BloomFilter:
+    """A fixed-size probabilistic set. Never reports a false negative."""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: derive all k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class VisitedSet:
+    """
+    Tracks seen URLs with bounded memory.
+    URLs are stored exactly until exact_limit is reached, after which everything
+    moves into a Bloom filter so memory stays flat on very large sites.
+    """
+
+    def __init__(self, exact_limit=VISITED_EXACT_LIMIT, capacity=VISITED_BLOOM_CAPACITY, error_rate=VISITED_BLOOM_ERROR_RATE):
+        self.exact_limit = exact_limit
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._exact = set()
+        self._bloom = None
+        self._count = 0
+
+    def add(self, url):
+        if url in self:
+            return
+        self._count += 1
+        if self._bloom is not None:
+            self._bloom.add(url)
+            return
+        self._exact.add(url)
+        if len(self._exact) > self.exact_limit:
+            print(f"  -> Visited set reached {self.exact_limit} URLs, switching to a Bloom filter.")
+            self._bloom = BloomFilter(max(self.capacity, self._count * 2), self.error_rate)
+            for seen_url in self._exact:
+                self._bloom.add(seen_url)
+            self._exact = set()
+
+    def __contains__(self, url):
+        if self._bloom is not None:
+            return url in self._bloom
+        return url in self._exact
+
+    def __len__(self):
+        return self._count
+
+class TrapDetector:
+    """Flags URLs that look like crawler traps (endless calendars, faceted navigation, etc.)."""
+
+    def __init__(self, max_path_depth=MAX_PATH_DEPTH, max_segment_repeats=MAX_PATH_SEGMENT_REPEATS,
+                 max_query_params=MAX_QUERY_PARAMS, max_query_variants=MAX_QUERY_VARIANTS_PER_PATH):
+        self.max_path_depth = max_path_depth
+        self.max_segment_repeats = max_segment_repeats
+        self.max_query_params = max_query_params
+        self.max_query_variants = max_query_variants
+        self._query_variants = defaultdict(int)
+
+    def check(self, url):
+        """Returns a short reason string if the URL is a trap, otherwise None."""
+        parts = urlparse(url)
+        segments = [s for s in parts.path.split('/') if s]
+
+        if len(segments) > self.max_path_depth:
+            return f"path deeper than {self.max_path_depth} segments"
+        if segments and max(Counter(segments).values()) > self.max_segment_repeats:
+            return "repeated path segments"
+
+        if parts.query:
+            if len(parse_qsl(parts.query, keep_blank_values=True)) > self.max_query_params:
+                return f"more than {self.max_query_params} query parameters"
+            path_key = (parts.netloc, parts.path)
+            if self._query_variants[path_key] >= self.max_query_variants:
+                return f"more than {self.max_query_variants} query variants of {parts.path}"
+            self._query_variants[path_key] += 1
+        return None
+
+    def restore(self, urls):
+        """Counts the query variants of URLs that already passed check(), e.g. when resuming a crawl."""
+        for url in urls:
+            parts = urlparse(url)
+            if parts.query:
+                self._query_variants[(parts.netloc, parts.path)] += 1
+
+class Frontier:
+    """
+    Priority queue of URLs waiting to be crawled.
+
+    priority selects what the page budget is spent on first:
+    - "depth": shallowest pages first (breadth-first).
+    - "sitemap": URLs listed in the sitemap first, then by depth.
+    - "inlinks": URLs with the most inbound links found so far first, then by depth.
+
+    At most max_pending URLs are kept queued. Past that the lowest-priority ones are
+    dropped (they stay in the visited set, so they are not queued again).
+    """
+
+    def __init__(self, priority=CRAWL_PRIORITY, sitemap_urls=None, visited=None, trap_detector=None,
+                 max_pending=MAX_PENDING_URLS):
+        if priority not in PRIORITY_STRATEGIES:
+            raise ValueError(f"Unknown crawl priority '{priority}'. Use one of: {', '.join(PRIORITY_STRATEGIES)}")
+        self.priority = priority
+        self.sitemap_urls = set(sitemap_urls or [])
+        self.visited = visited if visited is not None else VisitedSet()
+        self.trap_detector = trap_detector if trap_detector is not None else TrapDetector()
+        self.trap_count = 0
+        self.max_pending = max_pending
+        self.dropped_count = 0
+        self._heap = []
+        self._pending = {} # url -> (depth, inlinks, key, counter)
+        self._counter = 0
+
+    def _key(self, url, depth, inlinks):
+        if self.priority == "sitemap":
+            return (0 if url in self.sitemap_urls else 1, depth)
+        if self.priority == "inlinks":
+            return (-inlinks, depth)
+        return (depth,)
+
+    def _push(self, url, depth, inlinks, counter=None):
+        key = self._key(url, depth, inlinks)
+        if counter is None:
+            self._counter += 1
+            counter = self._counter
+        self._pending[url] = (depth, inlinks, key, counter)
+        heapq.heappush(self._heap, (key, counter, url))
+
+        if len(self._pending) > self.max_pending:
+            self._trim()
+        elif len(self._heap) > 2 * len(self._pending) + 1000:
+            # Re-prioritized URLs leave stale heap entries behind; drop them once they dominate
+            self._rebuild(list(self._pending.items()))
+
+    def _rebuild(self, entries):
+        self._pending = dict(entries)
+        self._heap = [(key, counter, url) for url, (_depth, _inlinks, key, counter) in entries]
+        heapq.heapify(self._heap)
+
+    def _trim(self):
+        # Keep the best 90% so trimming (a full sort) only happens once per max_pending / 10 new URLs
+        keep = int(self.max_pending * 0.9)
+        entries = heapq.nsmallest(keep, self._pending.items(), key=lambda item: (item[1][2], item[1][3]))
+        self.dropped_count += len(self._pending) - len(entries)
+        self._rebuild(entries)
+
+    def add(self, url, depth=0, check_traps=True):
+        """Queues a URL if it has not been seen before. Returns True if it was queued."""
+        if url in self._pending:
+            # Another page links here; only the inlinks strategy cares
+            if self.priority == "inlinks":
+                pending_depth, inlinks, _key, counter = self._pending[url]
+                self._push(url, min(depth, pending_depth), inlinks + 1, counter)
+            return False
+        if url in self.visited:
+            return False
+
+        self.visited.add(url)
+        if check_traps:
+            if self.trap_detector.check(url):
+                self.trap_count += 1
+                return False
+
+        self._push(url, depth, 1 if depth else 0)
+        return True
+
+    def pop(self):
+        """Returns the highest-priority (url, depth), or None when the frontier is empty."""
+        while self._heap:
+            key, counter, url = heapq.heappop(self._heap)
+            entry = self._pending.get(url)
+            if entry is None or entry[2:] != (key, counter):
+                continue # Stale entry superseded by a re-prioritized push
+            del self._pending[url]
+            return url, entry[0]
+        return None
+
+    def mark_visited(self, url):
+        self.visited.add(url)
+
+    def is_visited(self, url):
+        return url in self.visited
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __bool__(self):
+        return bool(self._pending)
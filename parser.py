@@ -1,92 +1,158 @@
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import hashlib
+import json
 from utils import normalize_url
-import re
+from config import REQUIRED_OPEN_GRAPH_TAGS, ROBOTS_USER_AGENTS
 
-def parse_page(url, html, base_netloc):
-    """Extracts all relevant SEO data from a single HTML page."""
-    soup = BeautifulSoup(html, "html.parser")
+PARSED_TAGS = ["title", "meta", "link", "h1", "h2", "a", "img", "script"]
+ROBOTS_META_NAMES = ("robots",) + ROBOTS_USER_AGENTS
+# Directives that carry their own "name: value" syntax and must not be read as a user-agent prefix
+VALUED_ROBOTS_DIRECTIVES = ("unavailable_after", "max-snippet", "max-image-preview", "max-video-preview")
 
-    # --- Basic Tags ---
-    title = soup.title.string.strip() if soup.title else ""
-    
-    # --- Meta Descriptions ---
-    meta_desc_tags = soup.find_all("meta", attrs={"name": re.compile(r"^description$", re.IGNORECASE)})
-    if not meta_desc_tags:
-        meta_desc_tags = soup.find_all("meta", attrs={"property": "og:description"})
-    meta_descriptions = [tag["content"].strip() for tag in meta_desc_tags if tag.has_attr("content")]
-    
-    # --- Headings ---
-    h1s = [h1.get_text(strip=True) for h1 in soup.find_all("h1")]
-    h2s = [h2.get_text(strip=True) for h2 in soup.find_all("h2")]
-
-    # --- Canonicals ---
-    canonical_tags = soup.find_all("link", rel="canonical")
-    # Normalize canonical URLs as well
-    canonicals = [normalize_url(tag["href"].strip()) for tag in canonical_tags if tag.has_attr("href")]
-
-    # --- Hreflang Tags ---
-    hreflang_tags = []
-    for link_tag in soup.find_all("link", rel="alternate", hreflang=True):
-        if link_tag.has_attr("href") and link_tag.has_attr("hreflang"):
-            hreflang_tags.append({
-                "hreflang": link_tag["hreflang"].strip(),
-                "href": normalize_url(link_tag["href"].strip())
-            })
+def parse_page(url, html, base_netloc, headers=None):
+    """
+    Extracts all relevant SEO data from a single HTML page.
+    headers are the HTTP response headers, used for the X-Robots-Tag directive.
+    All tags are collected in a single walk over the document.
+    """
+    from bs4 import BeautifulSoup # Loaded on the first parse, not at startup
 
-    # --- Content Analysis ---
-    text_content = soup.get_text(separator=' ', strip=True)
-    word_count = len(text_content.split())
-    content_hash = hashlib.sha256(text_content.encode('utf-8')).hexdigest()
+    soup = BeautifulSoup(html, "html.parser")
 
-    # --- Links ---
+    title = None
+    meta_descriptions = []
+    og_descriptions = []
+    robots_directives = []
+    open_graph = {}
+    h1s = []
+    h2s = []
+    canonicals = []
+    hreflang_tags = []
+    structured_data = []
+    structured_data_errors = []
     internal_links = set()
     external_links = set()
+    followed_internal_links = set()
+    nofollow_internal_links = set()
     all_links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if not href or href.startswith(('#', 'mailto:', 'tel:')):
-            continue
-        
-        full_url = urljoin(url, href)
-        # Normalize every link found
-        normalized_link = normalize_url(full_url)
-        parsed_full_url = urlparse(normalized_link)
+    images = []
 
-        # Get anchor text
-        anchor_text = a.get_text(strip=True)
+    for tag in soup.find_all(PARSED_TAGS):
+        name = tag.name
 
-        all_links.append({"url": normalized_link, "anchor_text": anchor_text})
+        # --- Basic Tags ---
+        if name == "title":
+            if title is None:
+                title = (tag.string or "").strip()
 
-        if parsed_full_url.netloc.replace("www.", "") == base_netloc:
-            internal_links.add(normalized_link)
-        else:
-            external_links.add(normalized_link)
+        # --- Meta Descriptions, Robots and Open Graph ---
+        elif name == "meta":
+            if not tag.has_attr("content"):
+                continue
+            content = tag["content"].strip()
+            meta_name = tag.get("name", "").strip().lower()
+            meta_property = tag.get("property", "").strip()
+            if meta_name == "description":
+                meta_descriptions.append(content)
+            elif meta_name in ROBOTS_META_NAMES:
+                robots_directives.extend(parse_robots_directives(content))
+            if meta_property.startswith("og:"):
+                open_graph.setdefault(meta_property, content)
+                if meta_property == "og:description":
+                    og_descriptions.append(content)
 
-    # --- Images (with lazy loading and data URI handling) ---
-    images = []
-    for img in soup.find_all("img"):
-        # Prioritize data-src for lazy-loaded images, then fall back to src
-        src = img.get('data-src') or img.get('src', '')
-        src = src.strip()
+        # --- Headings ---
+        elif name == "h1":
+            h1s.append(tag.get_text(strip=True))
+        elif name == "h2":
+            h2s.append(tag.get_text(strip=True))
 
-        # Ignore empty and data URIs
-        if not src or src.startswith('data:image'):
-            continue
+        # --- Canonicals and Hreflang Tags ---
+        elif name == "link":
+            rels = tag.get("rel") or []
+            if not tag.has_attr("href"):
+                continue
+            if "canonical" in rels:
+                # Normalize canonical URLs as well
+                canonicals.append(normalize_url(tag["href"].strip()))
+            elif "alternate" in rels and tag.has_attr("hreflang"):
+                hreflang_tags.append({
+                    "hreflang": tag["hreflang"].strip(),
+                    "href": normalize_url(tag["href"].strip())
+                })
+
+        # --- Structured Data (JSON-LD) ---
+        elif name == "script":
+            if tag.get("type", "").strip().lower() != "application/ld+json":
+                continue
+            try:
+                structured_data.extend(json_ld_types(json.loads(tag.string or tag.get_text())))
+            except ValueError as e:
+                structured_data_errors.append(str(e))
+
+        # --- Links ---
+        elif name == "a":
+            href = tag.get("href")
+            if not href or href.startswith(('#', 'mailto:', 'tel:')):
+                continue
+
+            full_url = urljoin(url, href)
+            # Normalize every link found
+            normalized_link = normalize_url(full_url)
+            parsed_full_url = urlparse(normalized_link)
+            is_nofollow = "nofollow" in (tag.get("rel") or [])
+
+            # Get anchor text
+            anchor_text = tag.get_text(strip=True)
 
-        # Prioritize data-alt for lazy-loaded images, then fall back to alt
-        if 'data-alt' in img.attrs:
-            alt = img.get('data-alt')
-        else:
-            alt = img.get('alt') # This will be None if 'alt' attribute is missing
-        
-        full_src_url = urljoin(url, src)
-        images.append({"src": full_src_url, "alt": alt.strip() if alt is not None else None})
+            all_links.append({"url": normalized_link, "anchor_text": anchor_text, "nofollow": is_nofollow})
+
+            if parsed_full_url.netloc.replace("www.", "") == base_netloc:
+                internal_links.add(normalized_link)
+                if is_nofollow:
+                    nofollow_internal_links.add(normalized_link)
+                else:
+                    followed_internal_links.add(normalized_link)
+            else:
+                external_links.add(normalized_link)
+
+        # --- Images (with lazy loading and data URI handling) ---
+        elif name == "img":
+            # Prioritize data-src for lazy-loaded images, then fall back to src
+            src = tag.get('data-src') or tag.get('src', '')
+            src = src.strip()
+
+            # Ignore empty and data URIs
+            if not src or src.startswith('data:image'):
+                continue
+
+            # Prioritize data-alt for lazy-loaded images, then fall back to alt
+            if 'data-alt' in tag.attrs:
+                alt = tag.get('data-alt')
+            else:
+                alt = tag.get('alt') # This will be None if 'alt' attribute is missing
+
+            full_src_url = urljoin(url, src)
+            images.append({"src": full_src_url, "alt": alt.strip() if alt is not None else None})
+
+    # Fall back to og:description when there is no standard meta description
+    if not meta_descriptions:
+        meta_descriptions = og_descriptions
+
+    # --- Robots Directives ---
+    x_robots_tag = (headers or {}).get("X-Robots-Tag", "")
+    all_directives = set(robots_directives) | set(parse_robots_directives(x_robots_tag))
+    noindex = bool(all_directives & {"noindex", "none"})
+    nofollow = bool(all_directives & {"nofollow", "none"})
+
+    # --- Content Analysis ---
+    text_content = soup.get_text(separator=' ', strip=True)
+    word_count = len(text_content.split())
+    content_hash = hashlib.sha256(text_content.encode('utf-8')).hexdigest()
 
     return {
         "url": url,
-        "title": title,
+        "title": title or "",
         "meta_descriptions": meta_descriptions,
         "h1s": h1s,
         "h2s": h2s,
@@ -98,4 +164,52 @@ def parse_page(url, html, base_netloc):
         "external_links": list(external_links),
         "images": images,
         "all_links": all_links,
-    }
\ No newline at end of file
+        "meta_robots": robots_directives,
+        "x_robots_tag": x_robots_tag,
+        "noindex": noindex,
+        "nofollow": nofollow,
+        # Internal links that are only ever linked with rel="nofollow" on this page
+        "nofollow_links": list(nofollow_internal_links - followed_internal_links),
+        "structured_data": structured_data,
+        "structured_data_errors": structured_data_errors,
+        "open_graph": open_graph,
+        "missing_open_graph": [prop for prop in REQUIRED_OPEN_GRAPH_TAGS if not open_graph.get(prop)],
+    }
+
+def parse_robots_directives(value):
+    """
+    Splits a meta robots or X-Robots-Tag value into lowercase directives that apply to us.
+    A user-agent prefix such as 'bingbot: noindex, nofollow' scopes the directives after it,
+    so only unprefixed directives and those aimed at ROBOTS_USER_AGENTS are returned.
+    """
+    directives = []
+    applies = True
+    for token in value.split(","):
+        token = token.strip().lower()
+        if ":" in token:
+            agent, _sep, rest = token.partition(":")
+            agent = agent.strip()
+            # User-agent names are single words; anything else (e.g. the '08:49:37 gmt' part
+            # of an unavailable_after date split at its comma) is not a prefix
+            if agent not in VALUED_ROBOTS_DIRECTIVES and agent and not any(c.isspace() for c in agent):
+                applies = agent in ROBOTS_USER_AGENTS
+                token = rest.strip()
+        if token and applies:
+            directives.append(token)
+    return directives
+
+def json_ld_types(data):
+    """Returns the @type values declared in a parsed JSON-LD document, including @graph items."""
+    types = []
+    items = data if isinstance(data, list) else [data]
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_type = item.get("@type")
+        if isinstance(item_type, list):
+            types.extend(str(t) for t in item_type)
+        elif item_type:
+            types.append(str(item_type))
+        if "@graph" in item:
+            types.extend(json_ld_types(item["@graph"]))
+    return types
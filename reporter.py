@@ -1,13 +1,16 @@
-import pandas as pd
-from openpyxl.styles import PatternFill, Font
-from openpyxl.worksheet.datavalidation import DataValidation
 from config import ISSUE_DETAILS, HEADER_COLOR
+import csv
 import datetime
 from urllib.parse import urlparse
 import re
 
 def generate_xlsx_report(issues, base_url, crawled_count):
     """Analyzes the data and generates a styled report in XLSX format."""
+    # pandas and openpyxl are slow to import, so only load them when a report is written
+    import pandas as pd
+    from openpyxl.styles import PatternFill, Font
+    from openpyxl.worksheet.datavalidation import DataValidation
+
     # Sanitize base_url for filename
     parsed_url = urlparse(base_url)
     domain_name = parsed_url.netloc.replace("www.", "").replace(".", "_") # Replace dots with underscores
@@ -94,3 +97,16 @@ def generate_xlsx_report(issues, base_url, crawled_count):
                 worksheet.column_dimensions[column_cells[0].column_letter].width = adjusted_width
 
     print(f"\nSEO analysis XLSX report saved to {report_filename}")
+
+def save_raw_data_csv(crawled_data, filename="seo_audit_raw_data.csv"):
+    """Saves the raw crawl records to CSV using only the standard library."""
+    fieldnames = []
+    for page in crawled_data:
+        for key in page:
+            if key not in fieldnames:
+                fieldnames.append(key)
+
+    with open(filename, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(crawled_data)
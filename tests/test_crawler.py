@@ -0,0 +1,43 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import crawl_page
+
+class RepeatedRobotsHeaderHandler(BaseHTTPRequestHandler):
+    """Sends noindex, nofollow in the second of two X-Robots-Tag headers."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        body = b"<html><title>Hidden</title><a href='/other'>other</a></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("X-Robots-Tag", "max-snippet: 50")
+        self.send_header("X-Robots-Tag", "noindex, nofollow")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    do_GET = _respond
+    do_HEAD = _respond
+
+def test_repeated_x_robots_tag_headers_are_all_obeyed(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    site = ThreadingHTTPServer(("127.0.0.1", 0), RepeatedRobotsHeaderHandler)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    netloc = f"127.0.0.1:{site.server_address[1]}"
+    try:
+        final_url, page = crawl_page(f"http://{netloc}/", netloc)
+    finally:
+        site.shutdown()
+
+    assert final_url == f"http://{netloc}/"
+    # Skipped at HEAD time, so nothing was downloaded, but it is still recorded as noindex
+    assert page["noindex"] and page["nofollow"]
+    assert not page["title"]
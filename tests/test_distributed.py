@@ -0,0 +1,178 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import MAX_QUERY_VARIANTS_PER_PATH
+from distributed import Coordinator, serve_coordinator, run_worker
+
+PAGES = {
+    "/": '<html><title>Home</title><a href="/a">a</a> <a href="/b">b</a> <a href="/c">c</a> '
+         '<a href="/d">d</a> <a href="/file.txt">file</a></html>',
+    "/b": "<html><title>Redirect target</title></html>",
+    # XML-RPC cannot carry this control character
+    "/c": "<html><title>Bad \x0b title</title></html>",
+}
+
+REDIRECTS = {"/a": "/b", "/d": "/file.txt"}
+
+class SiteHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        self.requests_seen.append((self.command, self.path))
+        if self.path in REDIRECTS:
+            self.send_response(301)
+            self.send_header("Location", REDIRECTS[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/file.txt":
+            body = b"not a page"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+        else:
+            body = PAGES.get(self.path, "").encode("utf-8")
+            self.send_response(200 if self.path in PAGES else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    do_GET = _respond
+    do_HEAD = _respond
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(port, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Nothing listening on port {port}")
+
+def test_redirect_to_pending_url_and_bad_characters_are_crawled(tmp_path, monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    SiteHandler.requests_seen.clear()
+    site = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{site.server_address[1]}/"
+    db_path = str(tmp_path / "crawl.sqlite")
+    port = _free_port()
+
+    def coordinate():
+        # Sitemap priority leases /a and /d while their redirect targets are still pending
+        coordinator = Coordinator(db_path, base_url, 10, priority="sitemap", sitemap_urls=[f"{base_url}a", f"{base_url}d"])
+        serve_coordinator(coordinator, "127.0.0.1", port, grace_seconds=0.5)
+        coordinator.close()
+
+    coordinator_thread = threading.Thread(target=coordinate, daemon=True)
+    coordinator_thread.start()
+    _wait_for_port(port)
+    try:
+        run_worker(f"http://127.0.0.1:{port}", batch_size=1, idle_seconds=0.1)
+    finally:
+        coordinator_thread.join(timeout=30)
+        site.shutdown()
+
+    pages = Coordinator(db_path, base_url, 10).crawled_data()
+    assert sorted(p["url"] for p in pages) == [base_url, f"{base_url}b", f"{base_url}c"]
+    assert next(p for p in pages if p["url"].endswith("/c"))["title"] == "Bad \x0b title"
+    # The non-HTML target of /d was checked once through the redirect and never leased again
+    assert SiteHandler.requests_seen.count(("HEAD", "/file.txt")) == 1
+
+def test_late_completion_from_expired_lease_is_ignored(tmp_path):
+    coordinator = Coordinator(str(tmp_path / "crawl.sqlite"), "http://example.com/", 10, lease_seconds=0)
+    first = coordinator.lease("w1", 1)
+    second = coordinator.lease("w2", 1) # The first lease has already expired
+    assert first["urls"] == second["urls"]
+
+    page = '{"url": "http://example.com/", "internal_links": [], "nofollow": false, "nofollow_links": []}'
+    assert coordinator.complete(first["lease_id"], [{"url": "http://example.com/", "page": page}]) == 0
+    state, lease_id = coordinator.db.execute("SELECT state, lease_id FROM frontier").fetchone()
+    assert (state, lease_id) == ("leased", second["lease_id"])
+
+    assert coordinator.complete(second["lease_id"], [{"url": "http://example.com/", "page": page}]) == 1
+    assert len(coordinator.crawled_data()) == 1
+
+def test_worker_waits_for_a_coordinator_that_starts_late(tmp_path, monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    site = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{site.server_address[1]}/"
+    port = _free_port()
+    recorded = []
+    worker = threading.Thread(target=lambda: recorded.append(
+        run_worker(f"http://127.0.0.1:{port}", batch_size=1, idle_seconds=0.1, unreachable_seconds=30)
+    ), daemon=True)
+    worker.start() # Connections are refused until the coordinator starts below
+
+    time.sleep(0.5)
+    coordinator = Coordinator(str(tmp_path / "crawl.sqlite"), base_url, 10)
+    try:
+        serve_coordinator(coordinator, "127.0.0.1", port, grace_seconds=0.5)
+        worker.join(timeout=30)
+    finally:
+        coordinator.close()
+        site.shutdown()
+    assert recorded == [3]
+
+def test_worker_gives_up_on_an_unreachable_coordinator():
+    assert run_worker(f"http://127.0.0.1:{_free_port()}", unreachable_seconds=0) == 0
+
+def test_coordinator_rejects_workers_without_the_token(tmp_path, monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    site = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{site.server_address[1]}/"
+    db_path = str(tmp_path / "crawl.sqlite")
+    port = _free_port()
+
+    def coordinate():
+        coordinator = Coordinator(db_path, base_url, 10)
+        serve_coordinator(coordinator, "127.0.0.1", port, grace_seconds=0.5, token="secret")
+        coordinator.close()
+
+    coordinator_thread = threading.Thread(target=coordinate, daemon=True)
+    coordinator_thread.start()
+    _wait_for_port(port)
+    try:
+        assert run_worker(f"http://127.0.0.1:{port}", token="wrong") == 0
+        assert run_worker(f"http://127.0.0.1:{port}", batch_size=1, idle_seconds=0.1, token="secret") == 3
+    finally:
+        coordinator_thread.join(timeout=30)
+        site.shutdown()
+
+def test_query_variant_limit_survives_a_restart(tmp_path):
+    db_path = str(tmp_path / "crawl.sqlite")
+    variants = [f"http://example.com/list?page={i}" for i in range(40)]
+
+    def complete_with_links(coordinator, links):
+        lease = coordinator.lease("w1", 1)
+        url = lease["urls"][0][0]
+        page = json.dumps({"url": url, "internal_links": links, "nofollow": False, "nofollow_links": []})
+        coordinator.complete(lease["lease_id"], [{"url": url, "final_url": url, "page": page}])
+
+    coordinator = Coordinator(db_path, "http://example.com/", 100)
+    complete_with_links(coordinator, variants[:20])
+    coordinator.close()
+
+    resumed = Coordinator(db_path, "http://example.com/", 100)
+    complete_with_links(resumed, variants[20:])
+    states = dict(resumed.db.execute("SELECT state, COUNT(*) FROM frontier WHERE url LIKE '%?%' GROUP BY state").fetchall())
+    assert states.get("trap") == 40 - MAX_QUERY_VARIANTS_PER_PATH
@@ -0,0 +1,88 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frontier import Frontier, TrapDetector, VisitedSet
+
+def drain(frontier):
+    urls = []
+    while frontier:
+        urls.append(frontier.pop()[0])
+    return urls
+
+def test_cap_drops_the_lowest_priority_urls():
+    frontier = Frontier("depth", max_pending=10)
+    for depth in range(11):
+        frontier.add(f"http://example.com/d{depth}", depth)
+
+    # Going over the cap keeps the best 90%, so the two deepest URLs are dropped
+    assert frontier.dropped_count == 2
+    assert drain(frontier) == [f"http://example.com/d{depth}" for depth in range(9)]
+    # Dropped URLs stay visited, so they are not queued again
+    assert not frontier.add("http://example.com/d10", 10)
+
+def test_inlinks_priority_follows_new_links():
+    frontier = Frontier("inlinks")
+    for name in ("a", "b", "c"):
+        frontier.add(f"http://example.com/{name}", 1)
+    frontier.add("http://example.com/c", 2)
+    frontier.add("http://example.com/c", 1)
+    frontier.add("http://example.com/b", 3)
+
+    assert len(frontier) == 3
+    # Stale heap entries from the re-prioritized pushes are skipped
+    assert [frontier.pop() for _ in range(3)] == [
+        ("http://example.com/c", 1), ("http://example.com/b", 1), ("http://example.com/a", 1)
+    ]
+    assert frontier.pop() is None
+
+def test_stale_heap_entries_are_rebuilt_away():
+    frontier = Frontier("inlinks")
+    frontier.add("http://example.com/popular", 1)
+    for _ in range(5000):
+        frontier.add("http://example.com/popular", 1)
+
+    assert len(frontier._heap) <= 1002
+    assert drain(frontier) == ["http://example.com/popular"]
+
+def test_sitemap_priority_puts_sitemap_urls_first():
+    frontier = Frontier("sitemap", sitemap_urls=["http://example.com/deep/listed"])
+    frontier.add("http://example.com/shallow", 1)
+    frontier.add("http://example.com/deep/listed", 3)
+    assert drain(frontier) == ["http://example.com/deep/listed", "http://example.com/shallow"]
+
+def test_visited_set_switches_to_a_bloom_filter():
+    visited = VisitedSet(exact_limit=3, capacity=1000, error_rate=0.001)
+    urls = [f"http://example.com/{i}" for i in range(10)]
+    for url in urls[:3]:
+        visited.add(url)
+    assert visited._bloom is None
+
+    for url in urls[3:]:
+        visited.add(url)
+    visited.add(urls[0]) # Already seen, not counted twice
+    assert visited._bloom is not None and not visited._exact
+    assert len(visited) == 10
+    assert all(url in visited for url in urls)
+    assert "http://example.com/never-added" not in visited
+
+def test_trap_reasons():
+    detector = TrapDetector(max_path_depth=3, max_segment_repeats=2, max_query_params=2, max_query_variants=2)
+    assert detector.check("http://example.com/a/b/c") is None
+    assert detector.check("http://example.com/a/b/c/d") == "path deeper than 3 segments"
+    assert detector.check("http://example.com/x/x/x") == "repeated path segments"
+    assert detector.check("http://example.com/list?a=1&b=2&c=3") == "more than 2 query parameters"
+
+    assert detector.check("http://example.com/list?page=1") is None
+    assert detector.check("http://example.com/list?page=2") is None
+    assert detector.check("http://example.com/list?page=3") == "more than 2 query variants of /list"
+    assert detector.check("http://example.com/other?page=3") is None
+
+def test_frontier_counts_and_skips_traps():
+    frontier = Frontier("depth", trap_detector=TrapDetector(max_path_depth=2))
+    assert frontier.add("http://example.com/a/b/c", 1) is False
+    assert frontier.add("http://example.com/a/b/c", 1) is False # Counted once, then just visited
+    assert frontier.add("http://example.com/a/b/c", 0, check_traps=False) is False
+    assert frontier.trap_count == 1
+    assert not frontier
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_page, parse_robots_directives, json_ld_types
+
+def test_unprefixed_directives_apply():
+    assert parse_robots_directives(" NoIndex , nofollow,") == ["noindex", "nofollow"]
+    assert parse_robots_directives("none") == ["none"]
+    assert parse_robots_directives("") == []
+
+def test_prefixed_directives_only_apply_to_our_user_agents():
+    assert parse_robots_directives("bingbot: noindex, nofollow") == []
+    assert parse_robots_directives("googlebot: noindex") == ["noindex"]
+    assert parse_robots_directives("SEO-Audit-Bot: nofollow") == ["nofollow"]
+    # A prefix scopes every directive after it, until the next prefix
+    assert parse_robots_directives("bingbot: noindex, nofollow, googlebot: noarchive") == ["noarchive"]
+    assert parse_robots_directives("noarchive, otherbot: noindex") == ["noarchive"]
+
+def test_valued_directives_are_not_read_as_user_agents():
+    assert parse_robots_directives("max-snippet: 50, noindex") == ["max-snippet: 50", "noindex"]
+    assert parse_robots_directives("otherbot: noindex, max-image-preview: large") == []
+    assert parse_robots_directives("unavailable_after: 2025-12-31T23:59:59Z, nofollow") == \
+        ["unavailable_after: 2025-12-31t23:59:59z", "nofollow"]
+
+def test_dates_containing_commas_do_not_hide_later_directives():
+    directives = parse_robots_directives("unavailable_after: Sunday, 06-Nov-94 08:49:37 GMT, noindex")
+    assert directives[0] == "unavailable_after: sunday"
+    assert directives[-1] == "noindex"
+
+def test_json_ld_types():
+    assert json_ld_types({"@type": "Article"}) == ["Article"]
+    assert json_ld_types([{"@type": ["Product", "Thing"]}, "ignored", {"name": "no type"}]) == ["Product", "Thing"]
+    assert json_ld_types({
+        "@context": "https://schema.org",
+        "@graph": [{"@type": "Organization"}, {"@type": "WebSite", "@graph": [{"@type": "WebPage"}]}],
+    }) == ["Organization", "WebSite", "WebPage"]
+
+def test_parse_page_scopes_robots_meta_and_records_invalid_json_ld():
+    html = """<html><head>
+        <meta name="bingbot" content="noindex">
+        <meta name="googlebot" content="nofollow">
+        <script type="application/ld+json">{"@type": "Article"}</script>
+        <script type="application/ld+json">{"@type": "Broken",}</script>
+    </head></html>"""
+    page = parse_page("https://example.com/", html, "example.com")
+    assert not page["noindex"]
+    assert page["nofollow"]
+    assert page["structured_data"] == ["Article"]
+    assert len(page["structured_data_errors"]) == 1
+
+def test_parse_page_reads_x_robots_tag_header():
+    page = parse_page("https://example.com/", "<html></html>", "example.com", {"X-Robots-Tag": "googlebot: none"})
+    assert page["noindex"] and page["nofollow"]
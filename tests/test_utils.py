@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import normalize_query, normalize_url
+
+def test_normalize_query_sorts_and_drops_tracking_parameters():
+    assert normalize_query("b=2&utm_source=news&a=1&gclid=xyz&UTM_Medium=email") == "a=1&b=2"
+    assert normalize_query("sid=1&PHPSESSID=2") == ""
+    assert normalize_query("") == ""
+
+def test_normalize_query_keeps_blank_and_repeated_values():
+    assert normalize_query("tag=b&q=&tag=a") == "q=&tag=a&tag=b"
+
+def test_normalize_url_merges_tracking_variants_of_a_page():
+    assert normalize_url("https://WWW.Example.com/shoes/?utm_campaign=x&size=9&color=red#reviews") == \
+        "https://example.com/shoes?color=red&size=9"
+    assert normalize_url("https://example.com") == "https://example.com/"
@@ -1,4 +1,5 @@
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from config import IGNORED_QUERY_PARAMS, IGNORED_QUERY_PARAM_PREFIXES
 
 def normalize_url(url):
     """Converts a URL to a canonical format.
@@ -6,17 +7,18 @@ def normalize_url(url):
     - Ensures root path is '/'.
     - Removes trailing slashes from other paths.
     - Lowercases scheme and netloc.
-    - Removes fragments, params, and queries.
+    - Removes fragments and params.
+    - Drops tracking query parameters and sorts the remaining ones.
     """
     try:
         parts = urlparse(url)
-        
+
         # Normalize scheme and netloc
         scheme = parts.scheme.lower()
         netloc = parts.netloc.lower()
         if netloc.startswith('www.'):
             netloc = netloc[4:]
-            
+
         path = parts.path
         # Standardize root path
         if not path:
@@ -24,17 +26,32 @@ def normalize_url(url):
         # Remove trailing slash if path is not the root
         elif len(path) > 1 and path.endswith('/'):
             path = path[:-1]
-        
+
+        # Keep meaningful query parameters so distinct pages are not merged
+        query = normalize_query(parts.query)
+
         # Reconstruct the URL with the normalized parts, removing fragments etc.
         normalized_parts = parts._replace(
             scheme=scheme,
             netloc=netloc,
             path=path,
             params='',
-            query='',
+            query=query,
             fragment=''
         )
         return urlunparse(normalized_parts)
     except Exception as e:
         print(f"Could not normalize URL {url}: {e}")
-        return url # Return original URL on error
\ No newline at end of file
+        return url # Return original URL on error
+
+def normalize_query(query):
+    """Removes tracking parameters from a query string and sorts the rest."""
+    if not query:
+        return ''
+    params = []
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        lowered = key.lower()
+        if lowered in IGNORED_QUERY_PARAMS or lowered.startswith(IGNORED_QUERY_PARAM_PREFIXES):
+            continue
+        params.append((key, value))
+    return urlencode(sorted(params))